@@ -1,7 +1,11 @@
 """Node definitions for the TalkingTables StateGraph."""
 
+from typing import Any, Dict, List, Optional
+from langchain_core.messages import HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import get_executor_for_config
 from langchain_openai import ChatOpenAI
-from langgraph.prebuilt import ToolNode
+from langgraph.types import Command
 from src.models.state import TalkingTablesState
 from src.tools import call_dbml_parser, read_current_dbml
 from src.config.settings import OPENAI_API_KEY, LLM_MODEL, LLM_TEMPERATURE
@@ -9,10 +13,129 @@ from src.agent.react_prompts import TALKING_TABLES_PROMPT
 
 # 1. Define the list of executable tool functions
 tools = [call_dbml_parser, read_current_dbml]
+tools_by_name = {t.name: t for t in tools}
+
+# Tools that only read from state. Distinct calls can run concurrently and
+# their results can be deduplicated; every other tool is run in order.
+READ_ONLY_TOOLS = {read_current_dbml.name}
+
+
+def _run_tool_call(
+    tool_call: Dict[str, Any],
+    state: TalkingTablesState,
+    config: Optional[RunnableConfig] = None,
+):
+    """Run a single tool call against the given state.
+
+    Mirrors ToolNode: the state is injected as ``state``, the graph's config
+    is passed through for callbacks and tracing, and any error is returned
+    to the LLM as an error ToolMessage instead of being raised.
+    """
+    tool = tools_by_name.get(tool_call["name"])
+    if tool is None:
+        return ToolMessage(
+            f"Error: {tool_call['name']} is not a valid tool, try one of [{', '.join(tools_by_name)}].",
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+            status="error",
+        )
+    try:
+        return tool.invoke({
+            "type": "tool_call",
+            "name": tool_call["name"],
+            "args": {**tool_call["args"], "state": state},
+            "id": tool_call["id"],
+        }, config)
+    except Exception as e:
+        return ToolMessage(
+            f"Error: {repr(e)}\n Please fix your mistakes.",
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+            status="error",
+        )
+
+
+def _previous_reads(state: TalkingTablesState) -> Dict[str, str]:
+    """Map each read-only result already returned in this turn to its tool call id."""
+    previous: Dict[str, str] = {}
+    for message in reversed(state.messages):
+        if isinstance(message, HumanMessage):
+            break
+        if isinstance(message, ToolMessage) and message.name in READ_ONLY_TOOLS:
+            previous[f"{message.name}:{message.content}"] = message.tool_call_id
+    return previous
+
+
+# 2. Define the Tool Node. This is the "Hands".
+def tool_node(state: TalkingTablesState, config: Optional[RunnableConfig] = None):
+    """
+    Executes the tool calls from the last AI message.
+
+    Consecutive read-only calls are grouped against the same state: identical
+    reads share a single run, and distinct reads run concurrently.
+    State-changing calls (call_dbml_parser) run one at a time so later calls
+    see their updates. Repeated reads of an unchanged schema within the
+    current turn are replaced with a short "unchanged" result to keep the
+    next prompt small.
+    """
+    tool_calls = state.messages[-1].tool_calls
+    seen_reads = _previous_reads(state)
+    messages: List[ToolMessage] = []
+    state_updates: Dict[str, Any] = {}
+
+    def record(tool_call: Dict[str, Any], output: Any):
+        nonlocal state
+        if isinstance(output, Command):
+            update = dict(output.update or {})
+            messages.extend(update.pop("messages", []))
+            state_updates.update(update)
+            state = state.model_copy(update=update)
+            return
+        if tool_call["name"] in READ_ONLY_TOOLS:
+            key = f"{output.name}:{output.content}"
+            if key in seen_reads:
+                output = ToolMessage(
+                    f"{output.name}: result unchanged since previous read (tool call {seen_reads[key]}).",
+                    name=output.name,
+                    tool_call_id=output.tool_call_id,
+                )
+            else:
+                seen_reads[key] = output.tool_call_id
+        messages.append(output)
+
+    # Split the calls into batches of consecutive read-only calls and single
+    # state-changing calls, preserving the order the LLM requested them in.
+    batches: List[List[Dict[str, Any]]] = []
+    for tool_call in tool_calls:
+        if tool_call["name"] in READ_ONLY_TOOLS and batches and batches[-1][0]["name"] in READ_ONLY_TOOLS:
+            batches[-1].append(tool_call)
+        else:
+            batches.append([tool_call])
+
+    for batch in batches:
+        if len(batch) == 1:
+            record(batch[0], _run_tool_call(batch[0], state, config))
+            continue
+        # Identical read-only calls share a single run.
+        unique: Dict[str, Dict[str, Any]] = {}
+        for tool_call in batch:
+            unique.setdefault(f"{tool_call['name']}:{sorted(tool_call['args'].items())}", tool_call)
+        if len(unique) == 1:
+            outputs = [_run_tool_call(next(iter(unique.values())), state, config)]
+        else:
+            # The context-aware executor keeps callbacks and tracing attached.
+            with get_executor_for_config(config) as executor:
+                outputs = list(executor.map(
+                    lambda tool_call: _run_tool_call(tool_call, state, config),
+                    unique.values(),
+                ))
+        results = dict(zip(unique, outputs))
+        for tool_call in batch:
+            output = results[f"{tool_call['name']}:{sorted(tool_call['args'].items())}"]
+            record(tool_call, output.model_copy(update={"tool_call_id": tool_call["id"]}))
+
+    return {"messages": messages, **state_updates}
 
-# 2. Instantiate the ToolNode with our list of tools. This is the "Hands".
-#    It will automatically execute the correct tool based on the LLM's decision.
-tool_node = ToolNode(tools)
 
 # 3. Define the Agent Node. This is the "Brain".
 def agent_node(state: TalkingTablesState):
@@ -28,4 +151,4 @@ def agent_node(state: TalkingTablesState):
     # Fix: Use dot notation for Pydantic object instead of dictionary access
     prompt = TALKING_TABLES_PROMPT.format(messages=state.messages)
     response = llm_with_tools.invoke(prompt)
-    return {"messages": [response]} 
\ No newline at end of file
+    return {"messages": [response]} 
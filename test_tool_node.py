@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Test script for the custom tool node (no API key required)."""
+
+import sys
+from unittest.mock import patch
+from langchain_core.messages import AIMessage, HumanMessage
+from src.agent.nodes import tool_node
+from src.models.state import TalkingTablesState
+
+
+class FakeParserClient:
+    """Parser client stub that accepts any schema."""
+    
+    base_url = "http://localhost:5001"
+    
+    async def parse_dbml(self, current_dbml, updated_dbml):
+        return {
+            "success": True,
+            "schema_json": {"tables": [updated_dbml]},
+            "diff_json": {"from": current_dbml, "to": updated_dbml},
+        }
+
+def test_tool_node():
+    """Test concurrent reads and deduplication of unchanged schema reads."""
+    
+    try:
+        print("🔧 Testing repeated reads in one message...")
+        tool_calls = [
+            {"name": "read_current_dbml", "args": {}, "id": "call_1", "type": "tool_call"},
+            {"name": "read_current_dbml", "args": {}, "id": "call_2", "type": "tool_call"},
+        ]
+        state = TalkingTablesState(
+            messages=[HumanMessage(content="Show me the schema"), AIMessage(content="", tool_calls=tool_calls)],
+            current_dbml="Table users {\n  id int [pk]\n}"
+        )
+        result = tool_node(state)
+        first, second = result["messages"]
+        
+        if "Table users" not in first.content or first.tool_call_id != "call_1":
+            print("❌ First read did not return the schema")
+            return False
+        if "unchanged since previous read" not in second.content or second.tool_call_id != "call_2":
+            print("❌ Repeated read was not deduplicated")
+            return False
+        print("✅ Repeated read deduplicated")
+        
+        print("🔧 Testing repeated read in a later step of the same turn...")
+        state = TalkingTablesState(
+            messages=list(state.messages) + result["messages"] + [
+                AIMessage(content="", tool_calls=[{"name": "read_current_dbml", "args": {}, "id": "call_3", "type": "tool_call"}])
+            ],
+            current_dbml=state.current_dbml
+        )
+        result = tool_node(state)
+        if "unchanged since previous read" not in result["messages"][0].content:
+            print("❌ Read of unchanged schema was not deduplicated")
+            return False
+        print("✅ Read of unchanged schema deduplicated")
+        
+        print("🔧 Testing read after the schema changed...")
+        state.current_dbml = "Table posts {\n  id int [pk]\n}"
+        result = tool_node(state)
+        if "Table posts" not in result["messages"][0].content:
+            print("❌ Read of changed schema was deduplicated")
+            return False
+        print("✅ Read of changed schema returned in full")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing tool node: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_tool_node_parser_and_errors():
+    """Test in-order parsing, state updates and error ToolMessages."""
+    
+    try:
+        print("🔧 Testing read, parse, read in one message...")
+        old_dbml = "Table users {\n  id int [pk]\n}"
+        new_dbml = "Table posts {\n  id int [pk]\n}"
+        tool_calls = [
+            {"name": "read_current_dbml", "args": {}, "id": "call_1", "type": "tool_call"},
+            {"name": "call_dbml_parser", "args": {"updated_dbml": new_dbml}, "id": "call_2", "type": "tool_call"},
+            {"name": "read_current_dbml", "args": {}, "id": "call_3", "type": "tool_call"},
+            {"name": "not_a_tool", "args": {}, "id": "call_4", "type": "tool_call"},
+        ]
+        state = TalkingTablesState(
+            messages=[HumanMessage(content="Add a posts table"), AIMessage(content="", tool_calls=tool_calls)],
+            current_dbml=old_dbml
+        )
+        with patch("src.tools.call_dbml_parser.get_parser_client", return_value=FakeParserClient()):
+            result = tool_node(state)
+        messages = result["messages"]
+        
+        if [m.tool_call_id for m in messages] != ["call_1", "call_2", "call_3", "call_4"]:
+            print(f"❌ Unexpected message order: {[m.tool_call_id for m in messages]}")
+            return False
+        if "Table users" not in messages[0].content or "successful" not in messages[1].content:
+            print("❌ Read or parse result is wrong")
+            return False
+        if "Table posts" not in messages[2].content or "unchanged" in messages[2].content:
+            print("❌ Read after parse did not return the new schema")
+            return False
+        if messages[3].status != "error" or "not a valid tool" not in messages[3].content:
+            print("❌ Unknown tool did not return an error ToolMessage")
+            return False
+        if result.get("current_dbml") != new_dbml:
+            print("❌ current_dbml was not updated")
+            return False
+        if result.get("dbml_json") != {"tables": [new_dbml]} or result.get("diff_json") != {"from": old_dbml, "to": new_dbml}:
+            print("❌ dbml_json/diff_json were not updated")
+            return False
+        print("✅ Parser ran in order and its update reached later calls")
+        
+        print("🔧 Testing a tool call that raises...")
+        tool_calls = [{"name": "call_dbml_parser", "args": {}, "id": "call_5", "type": "tool_call"}]
+        state = TalkingTablesState(
+            messages=[HumanMessage(content="Add a posts table"), AIMessage(content="", tool_calls=tool_calls)],
+            current_dbml=old_dbml
+        )
+        with patch("src.tools.call_dbml_parser.get_parser_client", return_value=FakeParserClient()):
+            result = tool_node(state)
+        message = result["messages"][0]
+        if message.status != "error" or message.tool_call_id != "call_5" or "updated_dbml" not in message.content:
+            print("❌ Tool exception did not return an error ToolMessage")
+            return False
+        if "current_dbml" in result:
+            print("❌ Failed tool call updated the state")
+            return False
+        print("✅ Failing tool call returned an error ToolMessage")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing tool node: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    print("🚀 Testing TalkingTables Tool Node")
+    print("=" * 50)
+    
+    success = test_tool_node() and test_tool_node_parser_and_errors()
+    
+    if success:
+        print("\n🎉 Tool node test completed successfully!")
+    else:
+        print("\n💥 Tool node test failed!")
+        sys.exit(1)